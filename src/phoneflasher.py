@@ -1,10 +1,23 @@
+import base64
+import contextlib
+import functools
+import http.client
+import logging
+import logging.handlers
 import os
 import queue
+import re
+import shutil
+import stat
+import struct
 import subprocess
 import threading
-import time
+import types
+import urllib.parse
 import urllib.request
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import sys
 import tkinter as tk
@@ -22,6 +35,29 @@ DOWNLOADS_DIR = BASE_DIR / "downloads"
 PLATFORM_TOOLS_URL = "https://dl.google.com/android/repository/platform-tools-latest-darwin.zip"
 PLATFORM_TOOLS_ZIP = DOWNLOADS_DIR / "platform-tools-latest-darwin.zip"
 
+LOG_MAX_LINES = 5000
+
+logger = logging.getLogger("phoneflasher")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+HTTP_HEADERS = {"User-Agent": f"{APP_NAME}/1.0", "Accept-Encoding": "gzip"}
+HTTP_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_WORKERS = 4
+EXTRACT_WORKERS = 4
+# Files smaller than this are fetched over a single connection.
+RANGED_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+# A dropped range connection is retried this many times, waiting 0.3s, 0.6s, 1.2s.
+RANGE_RETRIES = 3
+RANGE_RETRY_BACKOFF = 0.3
+# Single-stream downloads smaller than this are copied without progress logging.
+PROGRESS_MIN_SIZE = 50 * 1024 * 1024
+HTTP_MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Already compressed; asking for identity keeps Content-Length usable for ranges and progress.
+ARCHIVE_SUFFIXES = (".zip", ".dmg", ".pkg")
+
 VENDOR_TOOLS = {
     "Samsung Smart Switch (optional)": {
         "type": "dmg",
@@ -48,37 +84,406 @@ VENDOR_TOOLS = {
         "fallback_url": "https://developers.google.com/android/images",
     },
 }
+VENDOR_TOOLS = types.MappingProxyType(
+    {
+        sys.intern(name): types.MappingProxyType({**info, "urls": tuple(info["urls"])})
+        for name, info in VENDOR_TOOLS.items()
+    }
+)
+VENDOR_SLUGS = {name: name.replace(" ", "_").lower() for name in VENDOR_TOOLS}
+VENDOR_DEST = {name: VENDOR_DIR / slug for name, slug in VENDOR_SLUGS.items()}
+
+# "<serial>\t<state>" lines from `adb devices` and `fastboot devices`.
+DEVICE_LINE_RE = re.compile(r"^(\S+)\t[ \t]*(.+?)[ \t]*$", re.M)
+DEVICE_STATE_LABELS = {
+    "device": "Device connected",
+    "fastboot": "Device connected",
+    "unauthorized": "Unauthorized (accept the USB debugging prompt)",
+    "authorizing": "Authorizing",
+    "no permissions": "No permissions (check USB access)",
+    "offline": "Offline",
+    "connecting": "Connecting",
+    "bootloader": "Bootloader",
+    "recovery": "Recovery",
+    "rescue": "Rescue",
+    "sideload": "Sideload",
+    "host": "Host",
+}
+
+
+_DIRS_READY = False
 
 
 def ensure_dirs():
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
     for path in (TOOLS_DIR, VENDOR_DIR, DOWNLOADS_DIR):
         path.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
 
 
+@functools.lru_cache(maxsize=1)
 def platform_tools_paths():
     adb = TOOLS_DIR / "platform-tools" / "adb"
     fastboot = TOOLS_DIR / "platform-tools" / "fastboot"
     return adb, fastboot
 
 
+def device_state_label(state):
+    # adb appends details to some states, e.g. "no permissions (missing udev rules?)".
+    key = state.split(" (", 1)[0].split(";", 1)[0].strip().lower()
+    if key in DEVICE_STATE_LABELS:
+        return DEVICE_STATE_LABELS[key]
+    return f"Unknown state: {state}"
+
+
+def device_status(output):
+    devices = DEVICE_LINE_RE.findall(output)
+    if not devices:
+        return "No device"
+    labels = [device_state_label(state) for _, state in devices]
+    if len(devices) == 1:
+        return labels[0]
+    return ", ".join(f"{serial}: {label}" for (serial, _), label in zip(devices, labels))
+
+
 def is_macos():
     return sys.platform == "darwin"
 
 
-def open_path(path):
+def preallocate(fd, size):
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass
+    elif is_macos():
+        import fcntl
+
+        # macOS has no posix_fallocate. F_PREALLOCATE takes an fstore_t (flags, posmode,
+        # offset, length, bytesalloc) and reserves space without changing the file size.
+        f_preallocate, f_allocateall, f_peofposmode = 42, 0x4, 3
+        fstore = struct.pack("=Iiqqq", f_allocateall, f_peofposmode, 0, size, 0)
+        try:
+            fcntl.fcntl(fd, f_preallocate, fstore)
+        except OSError:
+            pass
+
+
+def extract_zip(archive, target):
+    root = target.resolve()
+    with zipfile.ZipFile(archive, "r") as zip_ref:
+        members = zip_ref.infolist()
+
+    # Create every directory up front so the workers never race on makedirs.
+    files = []
+    for member in members:
+        path = (target / member.filename).resolve()
+        if path != root and root not in path.parents:
+            raise zipfile.BadZipFile(f"Unsafe path in archive: {member.filename}")
+        if member.is_dir():
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            files.append(member)
+
+    # A ZipFile keeps one file position, so each worker thread opens its own.
+    local = threading.local()
+    opened = []
+    opened_lock = threading.Lock()
+
+    def extract(member):
+        zip_ref = getattr(local, "zip_ref", None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(archive, "r")
+            with opened_lock:
+                opened.append(zip_ref)
+        zip_ref.extract(member, target)
+
     try:
-        subprocess.run(["open", path], check=False)
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+            list(executor.map(extract, files))
+    finally:
+        for zip_ref in opened:
+            zip_ref.close()
+
+
+def launch_open(target):
+    # open(1) hands off to LaunchServices and exits, so there is nothing to wait on or capture.
+    try:
+        subprocess.Popen(
+            ["open", target],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+        )
     except Exception:
         return False
     return True
 
 
+def open_path(path):
+    return launch_open(path)
+
+
 def open_url(url):
+    return launch_open(url)
+
+
+class HTTPStatusError(OSError):
+    def __init__(self, status, reason):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+
+
+class RangeUnavailable(OSError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, maxsize, timeout):
+        self._maxsize = maxsize
+        self._timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._proxies = None
+
+    @contextlib.contextmanager
+    def open(self, method, url, headers=None):
+        response = self.request(method, url, headers)
+        try:
+            yield response
+        finally:
+            self.release(response)
+
+    def request(self, method, url, headers=None):
+        headers = {**HTTP_HEADERS, **(headers or {})}
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers)
+            location = response.getheader("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                response.read()
+                self.release(response)
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                response.read()
+                self.release(response)
+                raise HTTPStatusError(response.status, response.reason)
+            response.url = url
+            return response
+        raise OSError(f"Too many redirects: {url}")
+
+    def release(self, response):
+        if response.pool_released:
+            return
+        response.pool_released = True
+        conn = response.pool_conn
+        # A half-read body leaves the socket unusable, so only finished exchanges are kept.
+        if response.isclosed() and not response.will_close:
+            with self._lock:
+                idle = self._idle.setdefault(response.pool_key, [])
+                if len(idle) < self._maxsize:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _send(self, method, url, headers):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        conn, reused = self._acquire(key)
+        try:
+            response = self._exchange(conn, method, target, headers)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped the idle connection; retry once on a fresh one.
+            conn = self._connect(key)
+            try:
+                response = self._exchange(conn, method, target, headers)
+            except BaseException:
+                conn.close()
+                raise
+
+        if response.length == 0:
+            # HEAD and bodyless replies are complete once read.
+            response.read()
+        response.pool_key = key
+        response.pool_conn = conn
+        response.pool_released = False
+        return response
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _exchange(self, conn, method, target, headers):
+        headers = {**headers, **conn.proxy_headers}
+        conn.request(method, f"{conn.target_prefix}{target}", headers=headers)
+        return conn.getresponse()
+
+    def _connect(self, key):
+        scheme, host, port = key
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme}")
+        connection_class = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        )
+
+        proxy = self._proxy_for(scheme, host)
+        if proxy is None:
+            conn = connection_class(host, port, timeout=self._timeout)
+            conn.target_prefix = ""
+            conn.proxy_headers = {}
+            return conn
+
+        proxy_parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        proxy_headers = {}
+        if proxy_parts.username:
+            credentials = urllib.parse.unquote(proxy_parts.username)
+            credentials += f":{urllib.parse.unquote(proxy_parts.password or '')}"
+            token = base64.b64encode(credentials.encode()).decode("ascii")
+            proxy_headers["Proxy-Authorization"] = f"Basic {token}"
+
+        conn = connection_class(proxy_parts.hostname, proxy_parts.port, timeout=self._timeout)
+        if scheme == "https":
+            # HTTPS goes through a CONNECT tunnel; TLS is negotiated with the real host.
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            conn.target_prefix = ""
+            conn.proxy_headers = {}
+        else:
+            # Plain HTTP proxies take the absolute URL as the request target.
+            netloc = f"[{host}]" if ":" in host else host
+            if port is not None:
+                netloc += f":{port}"
+            conn.target_prefix = f"http://{netloc}"
+            conn.proxy_headers = proxy_headers
+        return conn
+
+    def _proxy_for(self, scheme, host):
+        # Same sources urlopen uses: *_proxy variables, then the macOS system settings.
+        if self._proxies is None:
+            self._proxies = urllib.request.getproxies()
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return proxy
+
+
+HTTP_POOL = ConnectionPool(maxsize=DOWNLOAD_WORKERS, timeout=HTTP_TIMEOUT)
+
+
+def content_length(response):
+    total_header = response.getheader("Content-Length")
+    return int(total_header) if total_header and total_header.isdigit() else 0
+
+
+def validators_path(dest):
+    return dest.with_name(f"{dest.name}.etag")
+
+
+def conditional_headers(dest):
+    if not dest.exists() or dest.stat().st_size == 0:
+        return {}
     try:
-        subprocess.run(["open", url], check=False)
-    except Exception:
-        return False
-    return True
+        etag, last_modified = (validators_path(dest).read_text().splitlines() + ["", ""])[:2]
+    except OSError:
+        return {}
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def save_validators(dest, response):
+    etag = response.getheader("ETag", "")
+    last_modified = response.getheader("Last-Modified", "")
+    if etag or last_modified:
+        validators_path(dest).write_text(f"{etag}\n{last_modified}\n")
+
+
+class DownloadProgress:
+    def __init__(self, name, total):
+        self._name = name
+        self._total = total
+        self._downloaded = 0
+        self._next_log_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def downloaded(self):
+        return self._downloaded
+
+    def add(self, count):
+        with self._lock:
+            self._downloaded += count
+            if not self._total or self._downloaded < self._next_log_at:
+                return
+            percent = (self._downloaded * 100) // self._total
+            logger.info(f"Downloading {self._name}: {percent - percent % 10}%")
+            # Skip ahead to the next 10% mark past any bucket a large chunk jumped over.
+            bucket = percent // 10 + 1
+            self._next_log_at = -(-self._total * bucket // 10)
+
+
+class TkTextHandler(logging.Handler):
+    def __init__(self, widget):
+        super().__init__()
+        self._widget = widget
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._closed = False
+        self.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+            with self._pending_lock:
+                self._pending.append(line)
+                if len(self._pending) > 1:
+                    # A flush is already scheduled and will pick this line up.
+                    return
+            if not self._closed:
+                self._widget.after_idle(self._flush)
+        except Exception:
+            # Nothing got scheduled, so drop the buffer; the next record schedules a new flush.
+            with self._pending_lock:
+                self._pending.clear()
+            self.handleError(record)
+
+    def close(self):
+        self._closed = True
+        super().close()
+
+    def _flush(self):
+        with self._pending_lock:
+            lines, self._pending = self._pending, []
+        if not lines or self._closed:
+            return
+        widget = self._widget
+        widget.configure(state="normal")
+        widget.insert(tk.END, "".join(f"{line}\n" for line in lines))
+        line_count = int(widget.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            widget.delete("1.0", f"{line_count - LOG_MAX_LINES}.0")
+        widget.see(tk.END)
+        widget.configure(state="disabled")
 
 
 class PhoneFlasherApp(tk.Tk):
@@ -88,9 +493,11 @@ class PhoneFlasherApp(tk.Tk):
         self.geometry("980x720")
         self.resizable(True, True)
 
-        self.log_queue = queue.Queue()
+        ensure_dirs()
+        self._refresh_tool_state()
         self._build_ui()
-        self._start_log_pump()
+        self._start_logging()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_ui(self):
         header = ttk.Frame(self)
@@ -138,7 +545,9 @@ class PhoneFlasherApp(tk.Tk):
             tools_buttons, text="Download Platform Tools", command=self.download_platform_tools
         ).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(
-            tools_buttons, text="Open Tools Folder", command=lambda: self._open_folder(TOOLS_DIR)
+            tools_buttons,
+            text="Open Tools Folder",
+            command=functools.partial(self._open_folder, TOOLS_DIR),
         ).pack(side=tk.LEFT)
 
         vendor_frame = ttk.LabelFrame(self.setup_tab, text="Vendor Tools (Optional)")
@@ -162,17 +571,17 @@ class PhoneFlasherApp(tk.Tk):
             ttk.Button(
                 row,
                 text="Download",
-                command=lambda name=tool_name: self.download_vendor_tool(name),
+                command=functools.partial(self.download_vendor_tool, tool_name),
             ).pack(side=tk.LEFT, padx=(0, 8))
             ttk.Button(
                 row,
                 text="Open Folder",
-                command=lambda name=tool_name: self._open_vendor_folder(name),
+                command=functools.partial(self._open_vendor_folder, tool_name),
             ).pack(side=tk.LEFT, padx=(0, 8))
             ttk.Button(
                 row,
                 text="Open Vendor Page",
-                command=lambda name=tool_name: self._open_vendor_page(name),
+                command=functools.partial(self._open_vendor_page, tool_name),
             ).pack(side=tk.LEFT)
 
     def _build_flash_tab(self):
@@ -232,7 +641,7 @@ class PhoneFlasherApp(tk.Tk):
             ttk.Button(
                 row,
                 text="Browse",
-                command=lambda e=entry: self._browse_file(e),
+                command=functools.partial(self._browse_file, entry),
             ).pack(side=tk.LEFT)
             self.flash_entries[key] = entry
 
@@ -257,24 +666,19 @@ class PhoneFlasherApp(tk.Tk):
         self.log_output.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
         self.log_output.configure(state="disabled")
 
-    def _start_log_pump(self):
-        self.after(100, self._flush_log)
+    def _start_logging(self):
+        log_queue = queue.SimpleQueue()
+        self.log_handler = TkTextHandler(self.log_output)
+        self.queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.log_listener = logging.handlers.QueueListener(log_queue, self.log_handler)
+        logger.addHandler(self.queue_handler)
+        self.log_listener.start()
 
-    def _flush_log(self):
-        while True:
-            try:
-                message = self.log_queue.get_nowait()
-            except queue.Empty:
-                break
-            self.log_output.configure(state="normal")
-            timestamp = time.strftime("%H:%M:%S")
-            self.log_output.insert(tk.END, f"[{timestamp}] {message}\n")
-            self.log_output.see(tk.END)
-            self.log_output.configure(state="disabled")
-        self.after(100, self._flush_log)
-
-    def log(self, message):
-        self.log_queue.put(message)
+    def _on_close(self):
+        # The listener thread is a daemon; joining it here could deadlock on a pending Tk call.
+        logger.removeHandler(self.queue_handler)
+        self.log_handler.close()
+        self.destroy()
 
     def _run_in_thread(self, target, *args):
         thread = threading.Thread(target=target, args=args, daemon=True)
@@ -290,7 +694,7 @@ class PhoneFlasherApp(tk.Tk):
             messagebox.showerror(APP_NAME, "Failed to open vendor page.")
 
     def _open_vendor_folder(self, tool_name):
-        vendor_dir = VENDOR_DIR / tool_name.replace(" ", "_").lower()
+        vendor_dir = VENDOR_DEST[tool_name]
         vendor_dir.mkdir(parents=True, exist_ok=True)
         self._open_folder(vendor_dir)
 
@@ -308,28 +712,35 @@ class PhoneFlasherApp(tk.Tk):
 
     def _download_platform_tools(self):
         ensure_dirs()
-        self.log("Downloading platform-tools...")
+        logger.info("Downloading platform-tools...")
         success = self._download_first_available([PLATFORM_TOOLS_URL], PLATFORM_TOOLS_ZIP)
         if not success:
-            self.log("Failed to download platform-tools.")
+            logger.warning("Failed to download platform-tools.")
             return
-        self.log("Extracting platform-tools...")
+        logger.info("Extracting platform-tools...")
         try:
-            with zipfile.ZipFile(PLATFORM_TOOLS_ZIP, "r") as zip_ref:
-                zip_ref.extractall(TOOLS_DIR)
+            extract_zip(PLATFORM_TOOLS_ZIP, TOOLS_DIR)
         except zipfile.BadZipFile:
-            self.log("Downloaded platform-tools zip is corrupted.")
+            logger.warning("Downloaded platform-tools zip is corrupted.")
             return
         self._ensure_executable()
-        self.log("Platform-tools extracted.")
+        self._refresh_tool_state()
+        logger.info("Platform-tools extracted.")
 
     def download_all_vendor_tools(self):
         self._run_in_thread(self._download_all_vendor_tools)
 
     def _download_all_vendor_tools(self):
-        for tool_name in VENDOR_TOOLS:
-            self.log(f"Downloading {tool_name}...")
-            self._download_vendor_tool(tool_name)
+        with ThreadPoolExecutor(max_workers=len(VENDOR_TOOLS)) as executor:
+            futures = {}
+            for tool_name in VENDOR_TOOLS:
+                logger.info(f"Downloading {tool_name}...")
+                futures[executor.submit(self._download_vendor_tool, tool_name)] = tool_name
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as exc:
+                    logger.warning(f"Failed to download {futures[future]} ({exc})")
 
     def download_vendor_tool(self, tool_name):
         self._run_in_thread(self._download_vendor_tool, tool_name)
@@ -337,24 +748,24 @@ class PhoneFlasherApp(tk.Tk):
     def _download_vendor_tool(self, tool_name):
         ensure_dirs()
         info = VENDOR_TOOLS[tool_name]
-        vendor_dir = VENDOR_DIR / tool_name.replace(" ", "_").lower()
+        vendor_dir = VENDOR_DEST[tool_name]
         vendor_dir.mkdir(parents=True, exist_ok=True)
 
         if not info["urls"]:
-            self.log(f"No direct download for {tool_name}. Opening vendor page.")
+            logger.info(f"No direct download for {tool_name}. Opening vendor page.")
             self._open_vendor_page(tool_name)
             return
 
         ext = ".dmg" if info["type"] == "dmg" else ".pkg"
-        dest = vendor_dir / f"{tool_name.replace(' ', '_').lower()}{ext}"
+        dest = vendor_dir / f"{VENDOR_SLUGS[tool_name]}{ext}"
 
         success = self._download_first_available(info["urls"], dest)
         if not success:
-            self.log(f"Failed to download {tool_name}. Opening vendor page.")
+            logger.warning(f"Failed to download {tool_name}. Opening vendor page.")
             self._open_vendor_page(tool_name)
             return
 
-        self.log(f"Saved {tool_name} installer.")
+        logger.info(f"Saved {tool_name} installer.")
 
     def _download_first_available(self, urls, dest):
         for url in urls:
@@ -363,61 +774,240 @@ class PhoneFlasherApp(tk.Tk):
                 if dest.exists() and dest.stat().st_size > 0:
                     return True
             except Exception as exc:
-                self.log(f"Download failed: {url} ({exc})")
+                logger.warning(f"Download failed: {url} ({exc})")
         return False
 
     def _download_file(self, url, dest):
-        request = urllib.request.Request(
-            url,
-            headers={"User-Agent": f"{APP_NAME}/1.0"},
-        )
-        with urllib.request.urlopen(request, timeout=30) as response:
-            total_header = response.getheader("Content-Length")
-            total = int(total_header) if total_header and total_header.isdigit() else 0
-            downloaded = 0
-            last_logged = -1
-            chunk_size = 256 * 1024
-            with open(dest, "wb") as handle:
-                while True:
-                    chunk = response.read(chunk_size)
-                    if not chunk:
-                        break
-                    handle.write(chunk)
-                    downloaded += len(chunk)
-                    if total:
-                        percent = int((downloaded / total) * 100)
-                        bucket = percent // 10
-                        if bucket > last_logged:
-                            last_logged = bucket
-                            self.log(f"Downloading {dest.name}: {bucket * 10}%")
+        headers = conditional_headers(dest)
+        if dest.suffix in ARCHIVE_SUFFIXES:
+            headers["Accept-Encoding"] = "identity"
+            probe = self._probe_download(url, headers)
+            if probe is not None:
+                if probe.status == 304:
+                    logger.info(f"{dest.name} is up to date.")
+                    return
+                total = content_length(probe)
+                accepts_ranges = probe.getheader("Accept-Ranges", "").lower() == "bytes"
+                url = probe.url
+                if accepts_ranges and total >= RANGED_DOWNLOAD_MIN_SIZE:
+                    range_headers = {"Accept-Encoding": "identity"}
+                    # If-Range makes the server send the whole file instead of a range of a
+                    # newer version, so parts of two versions never end up in one file.
+                    etag = probe.getheader("ETag", "")
+                    validator = etag if etag and not etag.startswith("W/") else None
+                    validator = validator or probe.getheader("Last-Modified")
+                    if validator:
+                        range_headers["If-Range"] = validator
+                    try:
+                        self._download_ranges(url, dest, total, range_headers)
+                    except RangeUnavailable as exc:
+                        logger.info(f"{exc}; downloading {dest.name} over one connection.")
+                        # HEAD already reported a change, and dest may now be truncated, so a
+                        # 304 on the retry must not pass the damaged file off as current.
+                        headers.pop("If-None-Match", None)
+                        headers.pop("If-Modified-Since", None)
+                    else:
+                        save_validators(dest, probe)
+                        return
+        self._download_stream(url, dest, headers)
+
+    def _probe_download(self, url, headers):
+        try:
+            with HTTP_POOL.open("HEAD", url, headers) as response:
+                return response
+        except HTTPStatusError:
+            # Some servers reject HEAD; a plain GET still works for them.
+            return None
+
+    def _download_ranges(self, url, dest, total, headers):
+        step = -(-total // DOWNLOAD_WORKERS)
+        ranges = [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+        abort = threading.Event()
+        # Check that the server really serves ranges before truncating the existing file.
+        for attempt in range(RANGE_RETRIES + 1):
+            try:
+                first = self._open_range(url, *ranges[0], total, headers)
+                break
+            except RangeUnavailable:
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt == RANGE_RETRIES:
+                    raise
+                self._wait_before_range_retry(attempt, ranges[0][0], ranges[0][1], exc, abort)
+        try:
+            progress = DownloadProgress(dest.name, total)
+            validators_path(dest).unlink(missing_ok=True)
+            fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                preallocate(fd, total)
+                os.ftruncate(fd, total)
+                with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                    futures = [
+                        executor.submit(
+                            self._download_range,
+                            url,
+                            fd,
+                            start,
+                            end,
+                            total,
+                            headers,
+                            progress,
+                            abort,
+                            first if index == 0 else None,
+                        )
+                        for index, (start, end) in enumerate(ranges)
+                    ]
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    except BaseException:
+                        # Stop the other ranges instead of waiting for them to finish.
+                        abort.set()
+                        for future in futures:
+                            future.cancel()
+                        raise
+            finally:
+                os.close(fd)
+        finally:
+            HTTP_POOL.release(first)
+
+    def _open_range(self, url, start, end, total, headers):
+        headers = {**headers, "Range": f"bytes={start}-{end}"}
+        try:
+            response = HTTP_POOL.request("GET", url, headers)
+        except HTTPStatusError as exc:
+            if exc.status < 500:
+                # 416/501 and friends: ranges are advertised but not actually served.
+                raise RangeUnavailable(f"Server rejected range request ({exc})") from exc
+            raise
+        try:
+            if response.status != 206:
+                raise RangeUnavailable(f"Server ignored range request (HTTP {response.status})")
+            content_range = response.getheader("Content-Range", "")
+            if content_range.replace(" ", "") != f"bytes{start}-{end}/{total}":
+                raise RangeUnavailable(f"Unexpected Content-Range {content_range!r}")
+        except BaseException:
+            HTTP_POOL.release(response)
+            raise
+        return response
+
+    def _download_range(self, url, fd, start, end, total, headers, progress, abort, response):
+        offset = start
+        for attempt in range(RANGE_RETRIES + 1):
+            try:
+                if response is None:
+                    # Retries resume from the last byte written rather than the range start.
+                    response = self._open_range(url, offset, end, total, headers)
+                try:
+                    while not abort.is_set():
+                        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        progress.add(len(chunk))
+                finally:
+                    HTTP_POOL.release(response)
+                    response = None
+                if offset == end + 1 or abort.is_set():
+                    return
+                raise OSError(f"incomplete download of bytes {offset}-{end}")
+            except RangeUnavailable:
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                if abort.is_set() or attempt == RANGE_RETRIES:
+                    raise
+                self._wait_before_range_retry(attempt, offset, end, exc, abort)
+
+    def _wait_before_range_retry(self, attempt, start, end, exc, abort):
+        delay = RANGE_RETRY_BACKOFF * 2**attempt
+        logger.info(f"Retrying bytes {start}-{end} in {delay:.1f}s ({exc})")
+        if abort.wait(delay):
+            raise OSError("download cancelled")
+
+    def _download_stream(self, url, dest, headers):
+        with HTTP_POOL.open("GET", url, headers) as response:
+            if response.status == 304:
+                logger.info(f"{dest.name} is up to date.")
+                return
+            total = content_length(response)
+            encoding = response.getheader("Content-Encoding", "identity").strip().lower()
+            # http.client does not decode bodies. Only gzip is advertised, because "deflate"
+            # is sent both raw and zlib-wrapped in practice.
+            if encoding == "gzip":
+                decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            elif encoding == "identity":
+                decoder = None
+            else:
+                raise OSError(f"unsupported Content-Encoding: {encoding}")
+            validators_path(dest).unlink(missing_ok=True)
+            fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                if total and decoder is None:
+                    preallocate(fd, total)
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, 0, total, os.POSIX_FADV_SEQUENTIAL)
+                if decoder is None and total < PROGRESS_MIN_SIZE:
+                    # Nothing to report for small or unsized bodies, so let shutil run the loop.
+                    with open(fd, "wb", closefd=False) as handle:
+                        shutil.copyfileobj(response, handle, DOWNLOAD_CHUNK_SIZE)
+                        received = handle.tell()
+                else:
+                    progress = DownloadProgress(dest.name, total)
+                    while True:
+                        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        progress.add(len(chunk))
+                        if decoder is not None:
+                            chunk = decoder.decompress(chunk)
+                        os.write(fd, chunk)
+                    if decoder is not None:
+                        os.write(fd, decoder.flush())
+                    received = progress.downloaded
+            finally:
+                os.close(fd)
+        if total and received != total:
+            raise OSError(f"incomplete download of {dest.name}")
+        save_validators(dest, response)
 
     def _ensure_executable(self):
-        adb_path, fastboot_path = platform_tools_paths()
-        for tool in (adb_path, fastboot_path):
-            if tool.exists():
-                tool.chmod(tool.stat().st_mode | 0o111)
+        for tool in platform_tools_paths():
+            try:
+                mode = stat.S_IMODE(os.stat(tool).st_mode)
+            except FileNotFoundError:
+                continue
+            if mode & 0o111 != 0o111:
+                os.chmod(tool, mode | 0o111)
 
     def refresh_devices(self):
         self._run_in_thread(self._refresh_devices)
 
+    def _refresh_tool_state(self):
+        platform_tools_paths.cache_clear()
+        adb_path, fastboot_path = platform_tools_paths()
+        self._adb_exists = adb_path.exists()
+        self._fastboot_exists = fastboot_path.exists()
+
     def _refresh_devices(self):
+        self._refresh_tool_state()
         adb_path, fastboot_path = platform_tools_paths()
-        adb_out = self._run_cmd([str(adb_path), "devices"]) if adb_path.exists() else ""
+        adb_out = self._run_cmd([str(adb_path), "devices"]).stdout if self._adb_exists else ""
         fastboot_out = (
-            self._run_cmd([str(fastboot_path), "devices"]) if fastboot_path.exists() else ""
+            self._run_cmd([str(fastboot_path), "devices"]).stdout
+            if self._fastboot_exists
+            else ""
         )
 
-        adb_status = "No device" if "\tdevice" not in adb_out else "Device connected"
-        fastboot_status = (
-            "No device" if not fastboot_out.strip() else "Device connected"
-        )
+        adb_status = device_status(adb_out)
+        fastboot_status = device_status(fastboot_out)
 
-        self.after(0, self._set_device_status, adb_status, fastboot_status)
+        self.after_idle(self._set_device_status, adb_status, fastboot_status)
 
-        if not adb_path.exists() or not fastboot_path.exists():
-            self.log("Platform-tools not installed. Download them in Setup.")
+        if not self._adb_exists or not self._fastboot_exists:
+            logger.warning("Platform-tools not installed. Download them in Setup.")
         else:
-            self.log("Refreshed device status.")
+            logger.info("Refreshed device status.")
 
     def _set_device_status(self, adb_status, fastboot_status):
         self.adb_status.configure(text=adb_status)
@@ -454,48 +1044,65 @@ class PhoneFlasherApp(tk.Tk):
         self._run_in_thread(self._flash_images, selections)
 
     def _flash_images(self, selections):
+        # fastboot runs chained commands in order and stops at the first failure.
+        args = []
         for partition, image_path in selections.items():
-            self.log(f"Flashing {partition} from {image_path}...")
-            self._fastboot_command("flash", partition, image_path)
+            args.extend(("flash", partition, image_path))
+        logger.info(f"Flashing {', '.join(selections)}...")
+        result = self._fastboot_command(*args)
+        if result is None:
+            return
+        if result.returncode != 0:
+            logger.warning(
+                "Flash sequence failed. Partitions after the failing one were not flashed."
+            )
+            return
 
-        self.log("Flash sequence complete.")
+        logger.info("Flash sequence complete.")
 
     def _adb_command(self, *args):
         adb_path, _ = platform_tools_paths()
-        if not adb_path.exists():
-            self.log("ADB not found. Download platform-tools first.")
-            return
-        self._run_cmd([str(adb_path), *args])
+        if not self._adb_exists:
+            logger.warning("ADB not found. Download platform-tools first.")
+            return None
+        return self._run_cmd([str(adb_path), *args])
 
     def _fastboot_command(self, *args):
         _, fastboot_path = platform_tools_paths()
-        if not fastboot_path.exists():
-            self.log("Fastboot not found. Download platform-tools first.")
-            return
-        self._run_cmd([str(fastboot_path), *args])
+        if not self._fastboot_exists:
+            logger.warning("Fastboot not found. Download platform-tools first.")
+            return None
+        return self._run_cmd([str(fastboot_path), *args])
 
     def _run_cmd(self, cmd):
-        self.log(f"Running: {' '.join(cmd)}")
+        logger.info(f"Running: {' '.join(cmd)}")
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                check=False,
+                bufsize=1,
             )
         except FileNotFoundError:
-            self.log("Command not found.")
-            return ""
-
-        output = (result.stdout or "") + (result.stderr or "")
-        output = output.strip()
-        if output:
-            self.log(output)
-        return output
+            logger.warning("Command not found.")
+            return subprocess.CompletedProcess(cmd, 127, stdout="")
+
+        # Callers already run on a worker thread, so read here and log each line as it lands.
+        lines = []
+        with proc.stdout:
+            for line in proc.stdout:
+                line = line.rstrip()
+                if line:
+                    lines.append(line)
+                    logger.info(line)
+        returncode = proc.wait()
+        if returncode != 0:
+            logger.warning(f"Command exited with status {returncode}.")
+        return subprocess.CompletedProcess(cmd, returncode, stdout="\n".join(lines))
 
 
 if __name__ == "__main__":
-    ensure_dirs()
     app = PhoneFlasherApp()
     if not is_macos():
         messagebox.showwarning(